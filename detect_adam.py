@@ -1,8 +1,11 @@
-from bs4 import BeautifulSoup, Tag
-from typing import Iterable, Set
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from html.parser import HTMLParser
+from typing import Iterable, Set, Union
 import re
 
 REQUIRED_HEADERS_ADAM = {"place", "athlete", "grade", "school", "time"}
+# Fixed-order copy for counting overlaps without allocating an intersection set
+_REQUIRED_HEADERS_ADAM_T = tuple(REQUIRED_HEADERS_ADAM)
 
 W_STRONG = 0.60
 W_HEADERS = 0.30
@@ -21,19 +24,23 @@ SYNONYMS = {
     "pl": "place",
 }
 
+# Prefer the C-backed lxml parser; fall back to the stdlib parser if it isn't installed.
+try:
+    import lxml  # noqa: F401
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+# Only build tree nodes for the results markup; head, scripts, nav etc. are skipped.
+# Matches keep their whole subtree, so the filter form comes with its <article>
+# and rows/cells with their <table>.
+_STRAINER = SoupStrainer(["article", "table", "pre", "div"])
+
 TIME_LIKE = re.compile(r"\b\d{1,2}:\d{2}(\.\d+)?\b|\b\d+\.\d+\b")
 
 def _normalize_tokens(tokens: Iterable[str]) -> Set[str]:
-    out = set()
-    for t in tokens:
-        if not t:
-            continue
-        s = t.strip().lower()
-        if not s:
-            continue
-        s = SYNONYMS.get(s, s)
-        out.add(s)
-    return out
+    synonym = SYNONYMS.get  # bound once, not looked up per token
+    return {synonym(s, s) for t in tokens if t and (s := t.strip().lower())}
 
 def has_milesplit_results_header_structure(soup: BeautifulSoup) -> bool:
     article = soup.find("article")
@@ -50,38 +57,113 @@ def has_milesplit_results_header_structure(soup: BeautifulSoup) -> bool:
         return False
     return bool(select.find_all("option"))
 
+class _ProbeDone(Exception):
+    pass
+
+class _StructProbe(HTMLParser):
+    """
+    Streaming version of has_milesplit_results_header_structure for raw HTML:
+    first <article> -> its first <header> -> form#frmMeetResultsDetailFilter
+    -> select#ddResultsPage -> an <option>. No tree is built, and feeding
+    stops as soon as the answer is known.
+    """
+    _CHAIN = (
+        ("article", None),
+        ("header", None),
+        ("form", "frmMeetResultsDetailFilter"),
+        ("select", "ddResultsPage"),
+        ("option", None),
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.ok = False
+        self._level = 0  # index into _CHAIN of the tag we're looking for next
+        self._open = 0   # nesting depth of the last matched tag's name
+
+    def handle_starttag(self, tag, attrs):
+        if self._level and tag == self._CHAIN[self._level - 1][0]:
+            self._open += 1
+        name, wanted_id = self._CHAIN[self._level]
+        if tag != name or (wanted_id is not None and dict(attrs).get("id") != wanted_id):
+            return
+        if self._level == len(self._CHAIN) - 1:
+            self.ok = True
+            raise _ProbeDone
+        self._level += 1
+        self._open = 1
+
+    def handle_endtag(self, tag):
+        if self._level and tag == self._CHAIN[self._level - 1][0]:
+            self._open -= 1
+            if self._open == 0:
+                raise _ProbeDone  # matched element closed without the next link in the chain
+
+def has_results_header_structure_raw(html: Union[str, bytes]) -> bool:
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    probe = _StructProbe()
+    try:
+        probe.feed(html)
+    except _ProbeDone:
+        pass
+    return probe.ok
+
 def _find_meetresults_tables(soup: BeautifulSoup) -> list[Tag]:
     container = soup.find(id="meetResultsBody")
     if not container:
         return []
     return container.find_all("table", recursive=True)
 
+def _cell_texts(node: Tag) -> list[str]:
+    # One descendants walk instead of find_all(["th", "td"]) + a second loop
+    return [el.get_text(" ", strip=True) for el in node.descendants if el.name in ("th", "td")]
+
+def _row_cell_texts(tr: Tag) -> list[str]:
+    # Direct <th>/<td> children only, so each row is scored on its own cells
+    return [el.get_text(" ", strip=True) for el in tr.children if el.name in ("th", "td")]
+
 def _header_tokens_for_table(tbl: Tag) -> Set[str]:
     # Prefer thead
     thead = tbl.find("thead")
     if thead:
-        cells = thead.find_all(["th", "td"])
-        return _normalize_tokens(c.get_text(" ", strip=True) for c in cells)
+        return _normalize_tokens(_cell_texts(thead))
 
     # Otherwise: examine first few rows, pick the best candidate
     best = set()
     for tr in tbl.find_all("tr", limit=4):
-        cells = tr.find_all(["th", "td"], recursive=False)
-        if len(cells) < 3:
+        texts = _row_cell_texts(tr)
+        if len(texts) < 3:
             continue
-        toks = _normalize_tokens(c.get_text(" ", strip=True) for c in cells)
+        toks = _normalize_tokens(texts)
         # Candidate row if it contains at least 2 required headers
-        if len(toks & REQUIRED_HEADERS_ADAM) >= 2 and len(toks) > len(best):
+        if sum(1 for h in _REQUIRED_HEADERS_ADAM_T if h in toks) >= 2 and len(toks) > len(best):
             best = toks
     return best
 
 def _table_looks_like_results(tbl: Tag) -> bool:
     # Quick heuristic: does it contain any time-like values?
-    text = tbl.get_text(" ", strip=True)
-    return bool(TIME_LIKE.search(text))
+    # Scan cell strings lazily and stop at the first time, usually in the first
+    # data row, instead of joining the whole table's text first.
+    return any(TIME_LIKE.search(s) for s in tbl.stripped_strings)
+
+def _contains(html: Union[str, bytes], marker: str) -> bool:
+    return (marker.encode() if isinstance(html, bytes) else marker) in html
+
+def detect_adam(html: Union[str, bytes, BeautifulSoup]) -> float:
+    raw = not isinstance(html, BeautifulSoup)
+
+    # Cheap substring check: neither results container nor filter form means no match
+    if raw and not _contains(html, "meetResultsBody") and not _contains(html, "frmMeetResultsDetailFilter"):
+        return 0.0
+
+    # No results container means no tables to score, only the structure bonus,
+    # so answer with the streaming probe instead of building a tree
+    if raw and not _contains(html, "meetResultsBody"):
+        return W_STRUCTURE if has_results_header_structure_raw(html) else 0.0
 
-def detect_adam(html: str) -> float:
-    soup = BeautifulSoup(html, "html.parser")
+    # Accept a soup that was already parsed by the caller so the page isn't re-parsed
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, _PARSER, parse_only=_STRAINER)
     score = 0.0
 
     structure_ok = has_milesplit_results_header_structure(soup)
@@ -100,7 +182,7 @@ def detect_adam(html: str) -> float:
     best_header_score = 0.0
     for tbl in candidate_tables:
         headers = _header_tokens_for_table(tbl)
-        overlap = len(REQUIRED_HEADERS_ADAM & headers)
+        overlap = sum(1 for h in _REQUIRED_HEADERS_ADAM_T if h in headers)
         if overlap:
             best_header_score = max(best_header_score, overlap / len(REQUIRED_HEADERS_ADAM))
             if best_header_score == 1.0:
@@ -1,5 +1,15 @@
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Prefer the C-backed lxml parser; fall back to the stdlib parser if it isn't installed.
+try:
+    import lxml  # noqa: F401
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+# Only build tree nodes for the results markup; head, scripts, nav etc. are skipped.
+_STRAINER = SoupStrainer(["div", "pre", "table"])
 
 def detect_cole(html_path: str) -> float:
     """
@@ -30,7 +40,7 @@ def detect_cole(html_path: str) -> float:
         print(f"Error: file not found → {html_path}")
         return 0.0
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, _PARSER, parse_only=_STRAINER)
     score = 0.0
 
     # --- Step 2: Identify results container ---
@@ -41,6 +51,13 @@ def detect_cole(html_path: str) -> float:
     pre_blocks = results_body.find_all("pre")
     table_blocks = results_body.find_all("table")
 
+    # --- Step 4 (checked first): Secondary indicator — block type check ---
+    # Cheap structural test, so table pages return before any text extraction
+    if pre_blocks and not table_blocks:
+        score += 0.3
+    else:
+        return 0.0  # stop early if structure doesn’t match
+
     # --- Step 3: Strong indicator — header presence ---
     for pre in pre_blocks:
         text = pre.get_text(" ", strip=True).lower()
@@ -48,13 +65,9 @@ def detect_cole(html_path: str) -> float:
             score += 0.6
             break  # only count once if found
 
-    # --- Step 4: Secondary indicator — block type check ---
-    if pre_blocks and not table_blocks:
-        score += 0.3
-    else:
-        return 0.0  # stop early if structure doesn’t match
-
     # --- Step 5: Weak indicator — no "Team Scores" section ---
+    # Plain get_text() on purpose: it joins strings with no separator, which
+    # is what this check has always matched against
     found_team_scores = any("team scores" in pre.get_text().lower() for pre in pre_blocks)
     if not found_team_scores:
         score += 0.1
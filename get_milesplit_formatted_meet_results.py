@@ -1,8 +1,28 @@
 import pandas as pd
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
 import re
 import os
+import sys
+import logging
+import asyncio
+import hashlib
+from typing import Union
+
+from detect_adam import REQUIRED_HEADERS_ADAM, detect_adam
+
+# Per-URL progress goes through logging so full runs can silence it (LOGLEVEL=WARNING)
+log = logging.getLogger("milesplit")
+
+
+def _configure_logging():
+    """
+    Configure the root logger from LOGLEVEL. Called by the script entry point
+    and as the parse pool's initializer, so the spawned workers log the same
+    way; importing this module leaves logging alone.
+    """
+    logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO").upper(), format="%(message)s")
 
 # ============================================================
 # CONSTANTS
@@ -11,19 +31,128 @@ import os
 INDIVIDUAL_TABLE_HEADERS = ['place', 'video', 'athlete', 'grade', 'team', 'finish', 'point']
 TEAM_TABLE_HEADERS       = ['place', 'tsTeam', 'point', 'wind', 'heat']
 
+# Table types the robust table parser recognises:
+# (name, identifying cell classes, fields a row needs besides a numeric place).
+# On a tie in class hits the earlier entry wins, so 'individual' stays first.
+TABLE_TYPES = [
+    ("individual", INDIVIDUAL_TABLE_HEADERS, ("athlete", "finish")),
+    ("team",       TEAM_TABLE_HEADERS,       ()),
+]
+
 TIME_PATTERN = re.compile(
     r"\d+:\d{2}(?:\.\d+)?|\d+:\d+:\d{2}(?:\.\d+)?"
 )  # mm:ss(.xx) or h:mm:ss(.xx)
 
 TAG_AFTER_TIME = re.compile(r"^(PR|SR|NR|DNF|DNS|DQ|NT)$", re.IGNORECASE)
 
+RACE_ID_PATTERN = re.compile(r"results/(\d+)/")
+
+# Detector patterns (compiled once, shared by detect_cole / detect_max)
+TIME_TOKEN_PATTERN    = re.compile(r"\d+:\d{2}(?:\.\d+)?")
+NUMERIC_GRADE_PATTERN = re.compile(r"\b\d+\s+[A-Za-z]+\s+[A-Za-z]+\s+(\d)\s+")  # "1 First Last 7 "
+GRADE_CODE_PATTERN    = re.compile(r"\b(FR|SO|JR|SR)\b")
+PLACE_MARKER_PATTERN  = re.compile(r"^\s+\d+\s", re.MULTILINE)
+TEAM_SCORES_PATTERN   = re.compile(r"Team\s+Scores", re.IGNORECASE)
+
+# Wrangler patterns
+WHITESPACE_PATTERN = re.compile(r"\s+")
+LINE_BREAK_PATTERN = re.compile(r"\s*[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]\s*")  # str.splitlines() boundaries
+INLINE_SPACE_PATTERN = re.compile(r"[^\S\n]+")
+
+# Runs over a whole _normalize_lines() block: one line per record, single
+# spaces between fields, so " " (never a newline) separates them
+COLE_LINE_PATTERN = re.compile(
+    r"^(?P<place>\d+)\.? "
+    r"(?:(?P<grade>\d+) )?"
+    r"(?P<name>[A-Za-z',.\- ]+?) "
+    r"(?P<time>\d+:\d{2}(?:\.\d+)?|\d+:\d+:\d{2}(?:\.\d+)?)"
+    r"(?: (?P<tag>[A-Za-z]+))? "
+    r"(?P<team>[A-Za-z][A-Za-z .'\-]+)$",
+    re.MULTILINE
+)  # place [grade] name time [tag] team
+COLE_PACKED_PATTERN = re.compile(
+    r"(?P<place>\d+)\.\s+"
+    r"(?:(?P<grade>\d+)\s+)?"
+    r"(?P<name>[A-Za-z',.\- ]+?)\s+"
+    r"(?P<time>\d+:\d{2}(?:\.\d+)?|\d+:\d+:\d{2}(?:\.\d+)?)"
+    r"(?:\s+(?P<tag>[A-Za-z]+))?\s+"
+    r"(?P<team>[A-Za-z][A-Za-z .'\-]+?)"
+    r"(?=\s+\d+\.|$)",
+    re.ASCII
+)  # same fields, records run together: "1. 10 Name 23:25 PR Team 2. ..."
+
+MAX_SECTION_PATTERN    = re.compile(r'(?=\b[A-Z][A-Za-z/ &-]+ (?:Boys|Girls)\b)')
+MAX_LINE_START_PATTERN = re.compile(r'^\d+\s')
+MAX_LINE_PATTERN = re.compile(
+    r'^(\d+)\s+([A-Za-z\'\-. ]+?)\s+(FR|SO|JR|SR)\s+'
+    r'([A-Za-z\'\-. ]+?)\s+\d*:?[\d.]*\s+(\d+:\d+(?:\.\d+)?)\s+(\d+)?$'
+)
+
+# Prefer the C-backed lxml parser; fall back to the stdlib parser if it isn't installed.
+try:
+    import lxml  # noqa: F401
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+# Only build tree nodes for the parts of the page the detectors/wranglers read.
+# Anything outside these tags (head, scripts, nav, footer) is skipped at parse time.
+# The strainer only filters top-level elements and keeps a match's whole subtree,
+# so rows/cells come with their <table> and the filter form with its <article>.
+_STRAINER = SoupStrainer(["article", "table", "pre", "div"])
+
+
+# Raw HTML (text, or undecoded bytes straight from a file/response) or a parsed soup
+Markup = Union[str, bytes, BeautifulSoup]
+
+
+def _as_soup(html: Markup) -> BeautifulSoup:
+    """
+    Accept raw HTML or an already-parsed soup, so a page parsed once in
+    extract_table_data_wrapped can be shared by every detector and wrangler.
+    Bytes go to the parser as-is, without first building a decoded str copy.
+    """
+    if isinstance(html, BeautifulSoup):
+        return html
+    return BeautifulSoup(html, _PARSER, parse_only=_STRAINER)
+
+
+def _lacks_markers(html: Markup, *markers: str) -> bool:
+    """
+    Cheap substring check on raw HTML: True if none of the markers occur,
+    meaning the page can't match and the parse can be skipped entirely.
+    Always False for an already-parsed soup.
+    """
+    if isinstance(html, bytes):
+        return not any(m.encode() in html for m in markers)
+    return isinstance(html, str) and not any(m in html for m in markers)
+
+
+def _scan_cells(tbl: Tag, with_text: bool = True) -> tuple[set, list]:
+    """
+    Walk a table's descendants once, collecting the classes of every
+    <td>/<th> (stripped, case preserved) and, if with_text, their texts.
+    Replaces repeated tbl.find_all(["td", "th"]) passes.
+    """
+    classes = set()
+    texts = []
+    for el in tbl.descendants:
+        if el.name not in ("td", "th"):
+            continue
+        # bs4 always hands back "class" as a list with both lxml and html.parser
+        for c in el.get("class") or ():
+            classes.add(c.strip())
+        if with_text:
+            texts.append(el.get_text(" ", strip=True))
+    return classes, texts
+
 
 # ============================================================
 # SHARED: extract_race_id
 # ============================================================
 
 def extract_race_id(url: str):
-    match = re.search(r'results/(\d+)/', url)
+    match = RACE_ID_PATTERN.search(url)
     return match.group(1) if match else None
 
 
@@ -36,194 +165,132 @@ def extract_race_id(url: str):
 REQUIRED_HEADERS_KATIE = {"place", "video", "athlete", "grade", "team", "finish", "point"}
 REQUIRED_HEADERS_COLE  = {"results", "print", "mile", "run"}  # loose hints
 REQUIRED_HEADERS_MAX   = {"fr", "so", "jr", "sr"}             # class codes
-REQUIRED_HEADERS_ADAM  = {"place", "athlete", "grade", "school", "time"}
 
 
 # ============================================================
 # IMPROVED DETECTORS
 # ============================================================
 
-def detect_cole(html: str) -> float:
+def _pre_text(soup: BeautifulSoup) -> Union[str, None]:
     """
-    Cole: PRE-based results with NUMERIC grades (6, 7, 8, etc.)
-    Format: "   1 Name             7 School              12:46.8"
+    Flattened text of every <pre> block in the results body, or None if
+    there is no results body or it has no <pre>. Shared by Cole and Max.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    score = 0.0
-
     results_body = soup.find(id="meetResultsBody") or soup.find(class_="meetResultsBody")
     if not results_body:
-        return 0.0
+        return None
 
     pre_blocks = results_body.find_all("pre")
     if not pre_blocks:
-        return 0.0
+        return None
+
+    return " ".join(pre.get_text(" ", strip=True) for pre in pre_blocks)
+
+
+def _score_cole(numeric_grades: int, grade_tokens: int, times: int, place_markers: int) -> float:
+    score = 0.0
 
-    # Flatten text
-    text_all = " ".join(pre.get_text(" ", strip=True) for pre in pre_blocks)
-    
     # STRONG INDICATOR: Numeric grades (single digits) with surrounding structure
     # Pattern: place number, then name, then single digit grade, then time
-    numeric_grade_pattern = re.compile(
-        r'\b\d+\s+[A-Za-z]+\s+[A-Za-z]+\s+(\d)\s+',  # Matches "1 First Last 7 "
-        re.MULTILINE
-    )
-    numeric_grades = numeric_grade_pattern.findall(text_all)
-    
-    if len(numeric_grades) >= 5:  # Found multiple numeric grades
+    if numeric_grades >= 5:  # Found multiple numeric grades
         score += 0.7
-    elif len(numeric_grades) >= 2:
+    elif numeric_grades >= 2:
         score += 0.4
-    
+
     # Time tokens
-    TIME_PATTERN = re.compile(r"\d+:\d{2}(?:\.\d+)?")
-    times = TIME_PATTERN.findall(text_all)
-    if len(times) >= 8:
+    if times >= 8:
         score += 0.2
-    elif len(times) >= 4:
+    elif times >= 4:
         score += 0.1
-    
+
     # Place markers with leading spaces (Cole format has "   1" not "1.")
-    place_markers = re.findall(r'^\s+\d+\s', text_all, re.MULTILINE)
-    if len(place_markers) >= 5:
+    if place_markers >= 5:
         score += 0.15
-    
+
     # PENALTY: FR/SO/JR/SR indicates Max format, not Cole
-    grade_tokens = re.findall(r'\b(FR|SO|JR|SR)\b', text_all)
-    if len(grade_tokens) >= 3:
+    if grade_tokens >= 3:
         score *= 0.3  # Strong penalty
-    
+
     return float(min(score, 1.0))
 
 
-def detect_max(html: str) -> float:
-    """
-    Max: PRE-based results with FR/SO/JR/SR grade codes.
-    Format: "1   Daniel Filipcik         SR   Woodside    5:11    15:18"
-    """
-    soup = BeautifulSoup(html, "html.parser")
+def _score_max(numeric_grades: int, grade_tokens: int, times: int, has_team_scores: bool) -> float:
     score = 0.0
 
-    results_body = soup.find(id="meetResultsBody") or soup.find(class_="meetResultsBody")
-    if not results_body:
-        return 0.0
-
-    pre_blocks = results_body.find_all("pre")
-    if not pre_blocks:
-        return 0.0
-
-    text_all = " ".join(pre.get_text(" ", strip=True) for pre in pre_blocks)
-    
     # STRONG INDICATOR: FR/SO/JR/SR tokens
-    grade_tokens = re.findall(r'\b(FR|SO|JR|SR)\b', text_all)
-    if len(grade_tokens) >= 8:  # Many grade codes
+    if grade_tokens >= 8:  # Many grade codes
         score += 0.7
-    elif len(grade_tokens) >= 4:
+    elif grade_tokens >= 4:
         score += 0.5
-    elif len(grade_tokens) >= 1:
+    elif grade_tokens >= 1:
         score += 0.2
-    
+
     # Time tokens
-    TIME_PATTERN = re.compile(r"\d+:\d{2}(?:\.\d+)?")
-    times = TIME_PATTERN.findall(text_all)
-    if len(times) >= 5:
+    if times >= 5:
         score += 0.2
-    
+
     # Team scores section (common in Max format)
-    if re.search(r'Team\s+Scores', text_all, re.IGNORECASE):
+    if has_team_scores:
         score += 0.15
-    
+
     # PENALTY: Single digit grades indicate Cole format
-    numeric_grade_pattern = re.compile(r'\b\d+\s+[A-Za-z]+\s+[A-Za-z]+\s+(\d)\s+')
-    numeric_grades = numeric_grade_pattern.findall(text_all)
-    if len(numeric_grades) >= 3:
+    if numeric_grades >= 3:
         score *= 0.4  # Penalty for Cole indicators
-    
-    return float(min(score, 1.0))
-
-from typing import Iterable, Set
-from bs4 import BeautifulSoup, Tag
-
-# --- Configuration ---
-REQUIRED_HEADERS_ADAM = {"place", "athlete", "grade", "school", "time"}
-
-# --- Weights ---
-W_STRONG = 0.65
-W_HEADERS = 0.3
-W_TABLECOUNT = 0.05
-W_STRUCTURE = 0.20   # NEW bonus for Milesplit results header structure
-
-
-def _normalize_tokens(tokens: Iterable[str]) -> Set[str]:
-    return {t.strip().lower() for t in tokens if t and t.strip()}
-
-
-def has_milesplit_results_header_structure(soup: BeautifulSoup) -> bool:
-    article = soup.find("article")
-    if not article:
-        return False
-    header = article.find("header")
-    if not header:
-        return False
-    form = header.find("form", id="frmMeetResultsDetailFilter")
-    if not form:
-        return False
-    select = form.find("select", id="ddResultsPage")
-    if not select:
-        return False
-    if not select.find_all("option"):
-        return False
-
-    return True
 
+    return float(min(score, 1.0))
 
-def _find_meetresults_tables(soup: BeautifulSoup) -> list[Tag]:
-    container = soup.find(id="meetResultsBody") or soup.find("div", id="meetResultsBody")
-    if not container:
-        return []
-    return container.find_all("table")
 
+def detect_pre_format(html: Markup) -> tuple[float, float]:
+    """
+    Score both PRE-based formats from one pass: the <pre> text is extracted
+    once and each regex runs over it once. Returns (cole_score, max_score).
+    """
+    if _lacks_markers(html, "meetResultsBody"):
+        return 0.0, 0.0
 
-# --- Main detector ---
-def detect_adam(html: str) -> float:
-    soup = BeautifulSoup(html, "html.parser")
-    score = 0.0
+    text_all = _pre_text(_as_soup(html))
+    if text_all is None:
+        return 0.0, 0.0
 
-    if has_milesplit_results_header_structure(soup):
-        score += W_STRUCTURE
+    numeric_grades = len(NUMERIC_GRADE_PATTERN.findall(text_all))
+    grade_tokens   = len(GRADE_CODE_PATTERN.findall(text_all))
+    times          = len(TIME_TOKEN_PATTERN.findall(text_all))
 
-    tables = _find_meetresults_tables(soup)
-    if not tables:
-        return score  # no tables → return whatever structural score we have
+    cole_score = _score_cole(
+        numeric_grades, grade_tokens, times,
+        place_markers=len(PLACE_MARKER_PATTERN.findall(text_all))
+    )
+    max_score = _score_max(
+        numeric_grades, grade_tokens, times,
+        has_team_scores=TEAM_SCORES_PATTERN.search(text_all) is not None
+    )
+    return cole_score, max_score
 
-    # Strong match for meetResultsBody structure
-    score += W_STRONG
 
-    # Header match (use best-scoring table)
-    best_header_score = 0.0
-    for tbl in tables:
-        headers = _normalize_tokens(
-            th.get_text(" ", strip=True)
-            for th in tbl.find_all(["th", "td"])
-        )
-        overlap = len(REQUIRED_HEADERS_ADAM.intersection(headers))
-        if overlap:
-            best_header_score = max(best_header_score, overlap / len(REQUIRED_HEADERS_ADAM))
+def detect_cole(html: Markup) -> float:
+    """
+    Cole: PRE-based results with NUMERIC grades (6, 7, 8, etc.)
+    Format: "   1 Name             7 School              12:46.8"
+    """
+    return detect_pre_format(html)[0]
 
-    score += W_HEADERS * best_header_score
 
-    if len(tables) >= 2:
-        score += W_TABLECOUNT
+def detect_max(html: Markup) -> float:
+    """
+    Max: PRE-based results with FR/SO/JR/SR grade codes.
+    Format: "1   Daniel Filipcik         SR   Woodside    5:11    15:18"
+    """
+    return detect_pre_format(html)[1]
 
-    return min(score, 1.0)
+# Adam (simple HTML tables) is scored by detect_adam, imported from detect_adam.py
 
 
-def detect_katie(html: str) -> float:
+def detect_katie(html: Markup) -> float:
     """
     Katie: Complex table-based pages with class-based cells 
     (e.g., <td class="place">, <td class="athlete">)
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     score = 0.0
 
     REQUIRED_HEADERS_KATIE = {"place", "video", "athlete", "grade", "team", "finish", "point"}
@@ -235,15 +302,10 @@ def detect_katie(html: str) -> float:
     best_hit = 0
     for tbl in tables:
         # Look for class-based cells
-        cell_classes = set()
-        for cell in tbl.find_all(["td", "th"]):
-            cls = cell.get("class", [])
-            if isinstance(cls, str):
-                cls = cls.split()
-            for c in cls:
-                cell_classes.add(c.strip().lower())
-        
-        hits = len(REQUIRED_HEADERS_KATIE.intersection(cell_classes))
+        classes, _ = _scan_cells(tbl, with_text=False)
+        cell_classes = {c.lower() for c in classes}
+
+        hits = sum(1 for h in REQUIRED_HEADERS_KATIE if h in cell_classes)
         best_hit = max(best_hit, hits)
 
     # STRONG INDICATOR: Class-based table structure
@@ -257,10 +319,7 @@ def detect_katie(html: str) -> float:
     # Look for 'eventtable' style classes
     has_event_table = False
     for tbl in tables:
-        cls = tbl.get("class", [])
-        if isinstance(cls, str):
-            cls = cls.split()
-        if any("eventtable" in c.lower() for c in cls):
+        if any("eventtable" in c.lower() for c in tbl.get("class") or ()):
             has_event_table = True
             break
     
@@ -274,20 +333,79 @@ def detect_katie(html: str) -> float:
 
     return float(min(score, 1.0))
 
+
+def score_all(html: Markup) -> dict:
+    """
+    Run all four detectors off a single parse of the page.
+    Cole and Max share one <pre> pass (detect_pre_format).
+    """
+    soup = _as_soup(html)
+    cole_score, max_score = detect_pre_format(soup)
+    return {
+        "cole": cole_score,
+        "max": max_score,
+        "adam": detect_adam(soup),
+        "katie": detect_katie(soup)
+    }
+
 # ============================================================
 # WRANGLERS
 # ============================================================
 
 def _normalize_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
 
 
-def wrangle_cole(html: str, race_url: str = None) -> pd.DataFrame:
+def _normalize_lines(text: str) -> str:
+    """
+    _normalize_whitespace applied to every line at once: blank lines dropped,
+    each line stripped and its whitespace runs collapsed, joined with "\n".
+    """
+    text = LINE_BREAK_PATTERN.sub("\n", text)
+    return INLINE_SPACE_PATTERN.sub(" ", text).strip()
+
+
+def _individual_frame(places, athletes, grades, teams, finishes, points=None) -> pd.DataFrame:
+    """
+    Build an individual-results frame from per-column lists, so pandas
+    infers each column's dtype once instead of walking a list of row dicts.
+    Numeric columns get explicit compact dtypes (place int32, point
+    nullable Int32), so no inference pass runs over them.
+    """
+    n = len(places)
+    return pd.DataFrame({
+        "place": pd.array(places, dtype="int32"),
+        "video": [None] * n,
+        "athlete": athletes,
+        "grade": grades,
+        "team": teams,
+        "finish": finishes,
+        "point": pd.array(points if points is not None else [pd.NA] * n, dtype="Int32")
+    }, columns=INDIVIDUAL_TABLE_HEADERS)
+
+
+def _append_row(columns: dict, row: dict, n_rows: int) -> None:
+    """
+    Append one record to a dict of column lists. Rows don't all carry the
+    same keys (e.g. *_url only when a cell has a link), so a column first
+    seen now is back-filled with None and columns this row lacks get None.
+    """
+    for key, value in row.items():
+        col = columns.get(key)
+        if col is None:
+            col = columns[key] = [None] * n_rows
+        col.append(value)
+    for col in columns.values():
+        if len(col) == n_rows:
+            col.append(None)
+
+
+def wrangle_cole(html: Markup, race_url: str = None) -> pd.DataFrame:
     """
     Robust PRE parser for Cole-style pages (numeric grades).
     Handles both line-based and '1. 10 Name 23:25 PR Team ...' packed text.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     results_div = soup.find("div", id="meetResultsBody") or soup.find("div", class_="meetResultsBody")
     if not results_div:
         return pd.DataFrame(columns=INDIVIDUAL_TABLE_HEADERS)
@@ -298,82 +416,48 @@ def wrangle_cole(html: str, race_url: str = None) -> pd.DataFrame:
 
     text = pre.get_text("\n", strip=True)
 
-    # first try line-based parsing
-    rows = []
-    for raw_line in text.splitlines():
-        line = _normalize_whitespace(raw_line)
-        if not re.match(r"^\d+", line):
-            continue
-
+    # first try line-based parsing;
+    # one MULTILINE finditer over the normalized block instead of a loop over splitlines()
+    places, athletes, grades, teams, finishes = [], [], [], [], []
+    for m in COLE_LINE_PATTERN.finditer(_normalize_lines(text)):
         # pattern: place [grade] name time [tag] team
-        m = re.match(
-            r"^(?P<place>\d+)\.?\s+"
-            r"(?:(?P<grade>\d+)\s+)?"
-            r"(?P<name>[A-Za-z',.\- ]+?)\s+"
-            r"(?P<time>\d+:\d{2}(?:\.\d+)?|\d+:\d+:\d{2}(?:\.\d+)?)"
-            r"(?:\s+(?P<tag>[A-Za-z]+))?\s+"
-            r"(?P<team>[A-Za-z][A-Za-z .'\-]+)$",
-            line
-        )
-        if not m:
-            continue
-
-        g = m.groupdict()
-        finish = g["time"]
+        place, grade, name, time, _tag, team = m.groups()
         # ignore tag (PR, SR, etc.) except we don't want to swallow time
-        rows.append({
-            "place": int(g["place"]),
-            "video": None,
-            "athlete": g["name"].strip(),
-            "grade": int(g["grade"]) if g["grade"] is not None else pd.NA,
-            "team": g["team"].strip(),
-            "finish": finish,
-            "point": pd.NA
-        })
+        places.append(int(place))
+        athletes.append(name.strip())
+        grades.append(int(grade) if grade is not None else pd.NA)
+        teams.append(team.strip())
+        finishes.append(time)
 
     # if we got enough rows, use them
-    if len(rows) >= 3:
-        return pd.DataFrame(rows, columns=INDIVIDUAL_TABLE_HEADERS)
+    if len(places) >= 3:
+        return _individual_frame(places, athletes, pd.array(grades, dtype="Int16"), teams, finishes)
 
     # otherwise, fall back to packed-text parsing:
     flat = _normalize_whitespace(text)
 
-    packed_pattern = re.compile(
-        r"(?P<place>\d+)\.\s+"
-        r"(?:(?P<grade>\d+)\s+)?"
-        r"(?P<name>[A-Za-z',.\- ]+?)\s+"
-        r"(?P<time>\d+:\d{2}(?:\.\d+)?|\d+:\d+:\d{2}(?:\.\d+)?)"
-        r"(?:\s+(?P<tag>[A-Za-z]+))?\s+"
-        r"(?P<team>[A-Za-z][A-Za-z .'\-]+?)"
-        r"(?=\s+\d+\.|$)"
-    )
-
-    rows = []
-    for m in packed_pattern.finditer(flat):
-        g = m.groupdict()
-        finish = g["time"]
-        rows.append({
-            "place": int(g["place"]),
-            "video": None,
-            "athlete": g["name"].strip(),
-            "grade": int(g["grade"]) if g["grade"] is not None else pd.NA,
-            "team": g["team"].strip(),
-            "finish": finish,
-            "point": pd.NA
-        })
-
-    if not rows:
+    # findall yields plain tuples (place, grade, name, time, tag, team),
+    # no match objects or groupdicts
+    places, athletes, grades, teams, finishes = [], [], [], [], []
+    for place, grade, name, time, _tag, team in COLE_PACKED_PATTERN.findall(flat):
+        places.append(int(place))
+        athletes.append(name.strip())
+        grades.append(int(grade) if grade else pd.NA)
+        teams.append(team.strip())
+        finishes.append(time)
+
+    if not places:
         return pd.DataFrame(columns=INDIVIDUAL_TABLE_HEADERS)
 
-    return pd.DataFrame(rows, columns=INDIVIDUAL_TABLE_HEADERS)
+    return _individual_frame(places, athletes, pd.array(grades, dtype="Int16"), teams, finishes)
 
 
-def wrangle_max(html: str, race_url: str = None):
+def wrangle_max(html: Markup, race_url: str = None):
     """
     PRE parser for Max-style pages with FR/SO/JR/SR grades.
     We keep your earlier pattern but with a bit of whitespace normalization.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _as_soup(html)
     container = soup.find("div", id="meetResultsBody") or soup.find("div", class_="meetResultsBody")
     if not container:
         return (
@@ -391,41 +475,33 @@ def wrangle_max(html: str, race_url: str = None):
     text = pre.get_text("\n", strip=True)
     text = _normalize_whitespace(text)
 
-    sections = re.split(r'(?=\b[A-Z][A-Za-z/ &-]+ (?:Boys|Girls)\b)', text)
-
-    rows = []
+    sections = MAX_SECTION_PATTERN.split(text)
 
-    line_pattern = re.compile(
-        r'^(\d+)\s+([A-Za-z\'\-. ]+?)\s+(FR|SO|JR|SR)\s+'
-        r'([A-Za-z\'\-. ]+?)\s+\d*:?[\d.]*\s+(\d+:\d+(?:\.\d+)?)\s+(\d+)?$'
-    )
+    places, athletes, grades, teams, finishes, points = [], [], [], [], [], []
 
+    # `text` is already whitespace-collapsed (no newlines left), so each
+    # section is a single line; no per-line split/re-normalization needed
     for section in sections:
-        section = section.strip()
-        if not section:
+        line = section.strip()
+        if not line or not MAX_LINE_START_PATTERN.match(line):
             continue
 
-        for raw_line in section.splitlines():
-            line = _normalize_whitespace(raw_line)
-            if not re.match(r'^\d+\s', line):
-                continue
-
-            m = line_pattern.match(line)
-            if not m:
-                continue
+        m = MAX_LINE_PATTERN.match(line)
+        if not m:
+            continue
 
-            place, athlete, grade, team, finish, point = m.groups()
-            rows.append({
-                "place": int(place),
-                "video": None,
-                "athlete": athlete.strip(),
-                "grade": grade,
-                "team": team.strip(),
-                "finish": finish,
-                "point": point if point else pd.NA
-            })
+        place, athlete, grade, team, finish, point = m.groups()
+        places.append(int(place))
+        athletes.append(athlete.strip())
+        grades.append(grade)
+        teams.append(team.strip())
+        finishes.append(finish)
+        points.append(int(point) if point else pd.NA)
 
-    indiv_df = pd.DataFrame(rows, columns=INDIVIDUAL_TABLE_HEADERS)
+    if places:
+        indiv_df = _individual_frame(places, athletes, grades, teams, finishes, points)
+    else:
+        indiv_df = pd.DataFrame(columns=INDIVIDUAL_TABLE_HEADERS)
     return indiv_df, pd.DataFrame(columns=TEAM_TABLE_HEADERS)
 
 
@@ -455,47 +531,40 @@ def wrangle_katie(html: str, race_url: str = None):
 # ROBUST TABLE PARSER (Katie-style but more tolerant)
 # ============================================================
 
-def extract_table_data(page_content: str, url: str):
+def extract_table_data(page_content: Markup, url: str):
     race_id = extract_race_id(url)
-    soup    = BeautifulSoup(page_content, 'html.parser')
+    soup    = _as_soup(page_content)
     tables  = soup.find_all('table')
 
     if not tables:
-        print(f"   No tables found for URL: {url}")
+        log.info("   No tables found for URL: %s", url)
         empty = {"individual": pd.DataFrame(), "team": pd.DataFrame()}
-        meta  = pd.DataFrame([{
+        meta  = [{
             "race_id": race_id,
             "url": url,
             "table_index": None,
             "table_type": "no_tables",
             "row_count": 0
-        }])
+        }]
         return empty, meta
 
-    all_data = {"individual": [], "team": []}
+    # Column lists per table type (see _append_row), plus row counts
+    all_data = {name: {} for name, _, _ in TABLE_TYPES}
+    n_rows   = {name: 0 for name, _, _ in TABLE_TYPES}
     metadata = []
 
-    indiv_headers_set = set(INDIVIDUAL_TABLE_HEADERS)
-    team_headers_set  = set(TEAM_TABLE_HEADERS)
+    header_sets   = {name: set(headers) for name, headers, _ in TABLE_TYPES}
+    required_keys = {name: required for name, _, required in TABLE_TYPES}
 
     for table_index, table in enumerate(tables, start=1):
         # Collect all classes in this table to decide type
-        cell_classes = set()
-        for cell in table.find_all(['td', 'th']):
-            cls = cell.get('class', [])
-            if isinstance(cls, str):
-                cls = cls.split()
-            for c in cls:
-                cell_classes.add(c.strip())
-
-        indiv_hits = indiv_headers_set.intersection(cell_classes)
-        team_hits  = team_headers_set.intersection(cell_classes)
-
-        if len(indiv_hits) >= 3 and len(indiv_hits) >= len(team_hits):
-            table_type = "individual"
-        elif len(team_hits) >= 3:
-            table_type = "team"
-        else:
+        cell_classes, _ = _scan_cells(table, with_text=False)
+
+        # Type with the most class hits (first listed wins ties), if it has at least 3
+        hits = [(name, sum(1 for h in headers if h in cell_classes)) for name, headers, _ in TABLE_TYPES]
+        table_type, best_hits = max(hits, key=lambda x: x[1])
+
+        if best_hits < 3:
             metadata.append({
                 "race_id": race_id,
                 "url": url,
@@ -505,6 +574,8 @@ def extract_table_data(page_content: str, url: str):
             })
             continue
 
+        headers_set = header_sets[table_type]
+
         tbody = table.find("tbody")
         if tbody:
             rows = tbody.find_all("tr")
@@ -517,45 +588,31 @@ def extract_table_data(page_content: str, url: str):
             if not cells:
                 continue
 
-            row_data = {
-                "race_id": race_id,
-                "race_url": url
-            }
+            # race_id / race_url are attached per frame after concat
+            # (see _concat_with_race), not repeated in every row dict
+            row_data = {}
 
             for cell in cells:
-                cls_list = cell.get("class", [])
-                if isinstance(cls_list, str):
-                    cls_list = cls_list.split()
+                cls_list = cell.get("class") or ()
 
                 text_val = cell.get_text(" ", strip=True)
 
                 for cls in cls_list:
                     cls = cls.strip()
-                    if table_type == "individual" and cls in indiv_headers_set:
-                        row_data[cls] = text_val
-                        link = cell.find("a")
-                        if link and link.get("href"):
-                            row_data[f"{cls}_url"] = link.get("href")
-                    elif table_type == "team" and cls in team_headers_set:
+                    if cls in headers_set:
                         row_data[cls] = text_val
                         link = cell.find("a")
                         if link and link.get("href"):
                             row_data[f"{cls}_url"] = link.get("href")
 
-            if table_type == "individual":
-                place_str = str(row_data.get("place", "")).strip()
-                if not place_str or not re.match(r"^\d+$", place_str):
-                    continue
-                if "athlete" not in row_data or "finish" not in row_data:
-                    continue
-                all_data["individual"].append(row_data)
-                added += 1
-            else:
-                place_str = str(row_data.get("place", "")).strip()
-                if not place_str or not re.match(r"^\d+$", place_str):
-                    continue
-                all_data["team"].append(row_data)
-                added += 1
+            place_str = str(row_data.get("place", "")).strip()
+            if not place_str or not place_str.isdecimal():
+                continue
+            if any(k not in row_data for k in required_keys[table_type]):
+                continue
+            _append_row(all_data[table_type], row_data, n_rows[table_type])
+            n_rows[table_type] += 1
+            added += 1
 
         metadata.append({
             "race_id": race_id,
@@ -565,59 +622,85 @@ def extract_table_data(page_content: str, url: str):
             "row_count": added
         })
 
-    metadata_df = pd.DataFrame(metadata)
-    indiv_df    = pd.DataFrame(all_data["individual"])
-    team_df     = pd.DataFrame(all_data["team"])
+    # Metadata stays a list of row dicts; the driver builds one frame for the whole run
+    data = {name: pd.DataFrame(columns) for name, columns in all_data.items()}
 
-    return {"individual": indiv_df, "team": team_df}, metadata_df
+    return data, metadata
 
 
 # ============================================================
 # WRAPPED PARSER (detectors + wranglers + fallback)
 # ============================================================
 
-def extract_table_data_wrapped(page_content: str, url: str):
+# A detector scoring at least this is taken as the answer; the rest are skipped.
+# Scores are float sums (Adam's 0.60 + 0.30 is 0.8999999999999999), so the
+# comparison allows a little slack.
+CONFIDENT_SCORE = 0.90
+SCORE_TOLERANCE = 1e-9
+
+
+def _is_confident(score: float) -> bool:
+    return score >= CONFIDENT_SCORE - SCORE_TOLERANCE
+
+
+def _detector_scores(soup: BeautifulSoup) -> dict:
+    # Structural detectors first, PRE text scan last; skipped detectors stay at 0.0
+    scores = {"cole": 0.0, "katie": 0.0, "max": 0.0, "adam": 0.0}
+    scores["adam"] = detect_adam(soup)
+    if not _is_confident(scores["adam"]):
+        scores["katie"] = detect_katie(soup)
+    if not _is_confident(max(scores.values())):
+        scores["cole"], scores["max"] = detect_pre_format(soup)
+
+    return scores
+
+
+def _with_parser(meta: list, parser: str) -> list:
+    for row in meta:
+        row["assigned_parser"] = parser
+    return meta
+
+
+def extract_table_data_wrapped(page_content: Union[str, bytes], url: str):
     race_id = extract_race_id(url)
 
-    cole_score  = detect_cole(page_content)
-    katie_score = detect_katie(page_content)
-    max_score   = detect_max(page_content)
-    adam_score  = detect_adam(page_content)
+    # Without a meetResultsBody the PRE/Adam detectors can't reach the 0.70
+    # threshold, so skip them (and their parse) and go straight to the table parser.
+    if _lacks_markers(page_content, "meetResultsBody"):
+        log.info("   No meetResultsBody on page; skipping detectors")
+        data, meta = extract_table_data(page_content, url)
+        return data, _with_parser(meta, "katie_fallback")
 
-    scores = {
-        "cole": cole_score,
-        "katie": katie_score,
-        "max": max_score,
-        "adam": adam_score
-    }
+    # Parse once; every detector and wrangler below works off this soup.
+    soup = _as_soup(page_content)
+
+    scores = _detector_scores(soup)
 
     best  = max(scores, key=scores.get)
     score = scores[best]
 
-    print(f"   Detector scores: {scores}, best = {best} ({score:.2f})")
+    log.info("   Detector scores: %s, best = %s (%.2f)", scores, best, score)
 
     try:
         if best == "cole" and score >= 0.70:
-            print("   [OUR PARSER] Using COLE pre-parser")
-            indiv_df = wrangle_cole(page_content, url)
+            log.info("   [OUR PARSER] Using COLE pre-parser")
+            indiv_df = wrangle_cole(soup, url)
             team_df  = pd.DataFrame(columns=TEAM_TABLE_HEADERS)
         elif best == "max" and score >= 0.70:
-            print("   [OUR PARSER] Using MAX pre-parser")
-            indiv_df, team_df = wrangle_max(page_content, url)
+            log.info("   [OUR PARSER] Using MAX pre-parser")
+            indiv_df, team_df = wrangle_max(soup, url)
         elif best == "adam" and score >= 0.70:
-            print("   [OUR PARSER] Using ADAM table parser (via robust fallback)")
+            log.info("   [OUR PARSER] Using ADAM table parser (via robust fallback)")
             # Adam's wrangler is stub; rely on robust table parser
-            data, meta = extract_table_data(page_content, url)
-            meta["assigned_parser"] = "adam"
-            return data, meta
+            data, meta = extract_table_data(soup, url)
+            return data, _with_parser(meta, "adam")
         else:
             # Katie (or uncertain) -> robust table parser
-            print("   [FALLBACK] Using robust table parser (Katie-style)")
-            data, meta = extract_table_data(page_content, url)
-            meta["assigned_parser"] = "katie_fallback"
-            return data, meta
+            log.info("   [FALLBACK] Using robust table parser (Katie-style)")
+            data, meta = extract_table_data(soup, url)
+            return data, _with_parser(meta, "katie_fallback")
 
-        meta = pd.DataFrame([{
+        meta = [{
             "race_id": race_id,
             "url": url,
             "assigned_parser": best,
@@ -625,15 +708,14 @@ def extract_table_data_wrapped(page_content: str, url: str):
             "table_type": best,
             "row_count": len(indiv_df) + len(team_df),
             "detector_score": score
-        }])
+        }]
 
         return {"individual": indiv_df, "team": team_df}, meta
 
     except Exception as e:
-        print(f"   ⚠ OUR WRANGLER ERROR ({best}) → falling back to robust table parser. Error: {e}")
-        data, meta = extract_table_data(page_content, url)
-        meta["assigned_parser"] = "katie_fallback_error"
-        return data, meta
+        log.warning("   ⚠ OUR WRANGLER ERROR (%s) → falling back to robust table parser. Error: %s", best, e)
+        data, meta = extract_table_data(soup, url)
+        return data, _with_parser(meta, "katie_fallback_error")
 
 
 # ============================================================
@@ -642,7 +724,22 @@ def extract_table_data_wrapped(page_content: str, url: str):
 
 import platform
 import os
-
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+# Fast non-cryptographic hash for spotting duplicate pages; blake2b if xxhash isn't installed.
+try:
+    import xxhash
+
+    def _page_digest(html: str) -> bytes:
+        return xxhash.xxh3_64_digest(html.encode())
+except ImportError:
+    def _page_digest(html: str) -> bytes:
+        return hashlib.blake2b(html.encode(), digest_size=8).digest()
+
+@functools.cache
 def get_chrome_path():
     system = platform.system()
 
@@ -658,79 +755,250 @@ def get_chrome_path():
     # fallback: no custom executable path
     return None
 
-def process_urls_and_save_wrapped(urls):
-    individual_results = pd.DataFrame()
-    team_results       = pd.DataFrame()
-    metadata_results   = pd.DataFrame()
 
-    with sync_playwright() as p:
-        chrome_path = get_chrome_path()
+# Resolved once at import rather than on every launch: the system Chrome
+# to use, if it is actually installed, else Playwright's bundled Chromium
+_CHROME_PATH = get_chrome_path()
+_CHROME_PATH_EXISTS = bool(_CHROME_PATH) and os.path.exists(_CHROME_PATH)
+
+def _error_meta(race_id, url, e) -> dict:
+    return {
+        "race_id": race_id,
+        "url": url,
+        "assigned_parser": "error",
+        "table_index": None,
+        "table_type": f'error - {e}',
+        "row_count": 0,
+        "detector_score": None
+    }
+
+
+# Matches the results DOM of every known format (HTML tables or the
+# #meetResultsBody <pre>/<div>), so we continue as soon as it is attached
+RESULTS_SELECTOR = "table, pre#meetResultsBody, div#meetResultsBody"
+
+
+# Subresources the results DOM doesn't need; aborted before they download
+BLOCKED_RESOURCE_TYPES = {"image", "stylesheet", "font", "media", "other"}
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com",
+    "doubleclick.net", "googlesyndication.com", "amazon-adsystem.com",
+    "scorecardresearch.com", "quantserve.com", "facebook.net",
+)
+
+
+def _should_block(request) -> bool:
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlparse(request.url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in BLOCKED_HOSTS)
+
+
+async def _block_nonessential(route):
+    if _should_block(route.request):
+        await route.abort()
+    else:
+        # fallback(), not continue_(): hand the request on to any earlier
+        # handler (the --cache HAR replay), which goes to the network on a miss
+        await route.fallback()
+
+
+# Recorded responses for --cache runs; replayed on later runs so the
+# same URL set isn't downloaded again during development
+HAR_CACHE_PATH = os.path.join("cache", "milesplit.har")
 
-        if chrome_path and os.path.exists(chrome_path):
-            browser = p.chromium.launch(
+
+async def _open_cached_context(browser):
+    """
+    Replay responses from HAR_CACHE_PATH if it exists (falling back to the
+    network for anything not in it), otherwise record a new HAR there.
+    The HAR is written when the context is closed.
+    """
+    if os.path.exists(HAR_CACHE_PATH):
+        log.info("Replaying cached responses from %s", HAR_CACHE_PATH)
+        context = await browser.new_context()
+        await context.route_from_har(HAR_CACHE_PATH, not_found="fallback")
+        return context
+
+    os.makedirs(os.path.dirname(HAR_CACHE_PATH), exist_ok=True)
+    log.info("Recording responses to %s", HAR_CACHE_PATH)
+    return await browser.new_context(record_har_path=HAR_CACHE_PATH, record_har_mode="minimal")
+
+
+async def _fetch_html(context, url: str) -> str:
+    """
+    Load one URL in a fresh page of `context` and return the rendered HTML.
+    Only the page is closed; the context is reused for the next URL.
+    """
+    page = await context.new_page()
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=120000)
+
+        try:
+            await page.wait_for_selector(RESULTS_SELECTOR, state="attached", timeout=15000)
+        except PlaywrightTimeoutError:
+            log.warning("   ⚠ No results found after 15 seconds — continuing (%s)", url)
+
+        return await page.content()
+    finally:
+        await page.close()
+
+
+async def _fetch_and_parse_all(urls, pool, concurrency: int, cache: bool = False):
+    """
+    Fetch all URLs with `concurrency` workers, each holding one
+    BrowserContext for its whole run (a new page per URL), and parse each
+    page in `pool` as soon as it arrives, keeping the event loop free of
+    BeautifulSoup work. With `cache`, the workers share one HAR-backed
+    context instead.
+    Returns (race_id, url, (data, metadata) or None, error or None) in URL order.
+    """
+    loop = asyncio.get_running_loop()
+
+    queue = asyncio.Queue()
+    for i, url in enumerate(urls):
+        queue.put_nowait((i, url))
+
+    # (race_id, url, parse future or None, fetch error or None) per URL
+    fetched = [None] * len(urls)
+
+    # Parse futures by page hash: mirrored/redirected URLs that serve the
+    # same HTML share one parse instead of repeating parse + detectors.
+    # Kept for the whole run, like the results themselves.
+    parses = {}
+
+    async with async_playwright() as p:
+        if _CHROME_PATH_EXISTS:
+            browser = await p.chromium.launch(
                 headless=True,
-                executable_path=chrome_path
+                executable_path=_CHROME_PATH
             )
         else:
             # Fallback to Playwright's bundled Chromium
-            browser = p.chromium.launch(headless=True)
-              
-        
-        page = browser.new_page()
+            browser = await p.chromium.launch(headless=True)
 
-        for url in urls:
-            race_id = extract_race_id(url)
-            print(f"\n🔍 Processing URL: {url}")
+        shared_context = await _open_cached_context(browser) if cache else None
+        if shared_context is not None:
+            await shared_context.route("**/*", _block_nonessential)
 
+        async def worker():
+            if shared_context is not None:
+                context = shared_context
+            else:
+                context = await browser.new_context()
+                await context.route("**/*", _block_nonessential)
+            try:
+                while not queue.empty():
+                    i, url = queue.get_nowait()
+                    log.info("\n🔍 Processing URL: %s", url)
+                    race_id = extract_race_id(url)
+                    try:
+                        html_content = await _fetch_html(context, url)
+                    except Exception as e:
+                        fetched[i] = (race_id, url, None, e)
+                        continue
+                    # Hand off to the pool and move straight on to the next URL
+                    digest = _page_digest(html_content)
+                    parse = parses.get(digest)
+                    if parse is None:
+                        parse = parses[digest] = loop.run_in_executor(
+                            pool, extract_table_data_wrapped, html_content, url
+                        )
+                    else:
+                        log.info("   Same page as an earlier URL; reusing its parse (%s)", url)
+                    fetched[i] = (race_id, url, parse, None)
+            finally:
+                if context is not shared_context:
+                    await context.close()
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(urls)))))
+
+        if shared_context is not None:
+            await shared_context.close()
+        await browser.close()
+
+    outcomes = []
+    for race_id, url, parse, error in fetched:
+        result = None
+        if parse is not None:
             try:
-                page.goto(url, wait_until="domcontentloaded", timeout=120000)
-                page.wait_for_load_state("domcontentloaded")
-                page.wait_for_timeout(3000)
+                data, metadata = await parse
+            except Exception as e:
+                error = e
+            else:
+                # A shared parse carries the first URL's ids; stamp this URL's
+                # onto copies so the first URL's rows are left as they are
+                result = data, [{**row, "race_id": race_id, "url": url} for row in metadata]
+        outcomes.append((race_id, url, result, error))
 
-                try:
-                    page.wait_for_selector("table", timeout=15000)
-                except:
-                    print("   ⚠ No table found after 15 seconds — continuing")
+    return outcomes
 
-                html_content = page.content()
 
-                data, metadata = extract_table_data_wrapped(html_content, url)
+def _concat_with_race(parts) -> pd.DataFrame:
+    """
+    Concatenate per-URL (race_id, url, frame) parts and attach race_id /
+    race_url as the first two columns in one go, each repeated by its
+    frame's length, instead of setting them row by row or frame by frame.
+    """
+    if not parts:
+        return pd.DataFrame()
 
-                if not data["individual"].empty:
-                    individual_results = pd.concat(
-                        [individual_results, data["individual"]],
-                        ignore_index=True
-                    )
+    race_ids, race_urls, frames = zip(*parts)
+    sizes  = [len(frame) for frame in frames]
+    result = pd.concat(frames, ignore_index=True)
+    result.insert(0, "race_id", pd.Index(race_ids).repeat(sizes))
+    result.insert(1, "race_url", pd.Index(race_urls).repeat(sizes))
+    return result
 
-                if not data["team"].empty:
-                    team_results = pd.concat(
-                        [team_results, data["team"]],
-                        ignore_index=True
-                    )
 
-                if metadata is not None and not metadata.empty:
-                    metadata_results = pd.concat(
-                        [metadata_results, metadata],
-                        ignore_index=True
-                    )
+def process_urls_and_save_wrapped(urls, max_workers=None, concurrency=12, cache=False):
+    """
+    Fetch the URLs with async Playwright, up to `concurrency` pages at a
+    time, and parse each page in a process pool as it arrives, so network
+    waits overlap each other and detection/wrangling runs on other cores.
+    Results are combined in URL order.
+    With `cache`, responses are recorded to / replayed from HAR_CACHE_PATH.
+    """
+    # Per-URL (race_id, url, frame) parts, concatenated once at the end
+    # rather than re-copying the accumulated results on every URL
+    individual_parts  = []
+    team_parts        = []
+    metadata_rows     = []
+
+    # "spawn" so workers never fork the Playwright driver's threads
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_configure_logging
+    )
 
-            except Exception as e:
-                print(f"   ERROR processing URL {url}: {e}")
-                error_meta = pd.DataFrame([{
-                    "race_id": race_id,
-                    "url": url,
-                    "assigned_parser": "error",
-                    "table_index": '',
-                    "table_type": f'error - {e}',
-                    "row_count": 0,
-                    "detector_score": None
-                }])
-                metadata_results = pd.concat(
-                    [metadata_results, error_meta],
-                    ignore_index=True
-                )
+    with pool:
+        outcomes = asyncio.run(_fetch_and_parse_all(urls, pool, concurrency, cache))
 
-        browser.close()
+    for race_id, url, result, error in outcomes:
+        if error is not None:
+            log.error("   ERROR processing URL %s: %s", url, error)
+            metadata_rows.append(_error_meta(race_id, url, error))
+            continue
+
+        data, metadata = result
+
+        if not data["individual"].empty:
+            individual_parts.append((race_id, url, data["individual"]))
+
+        if not data["team"].empty:
+            team_parts.append((race_id, url, data["team"]))
+
+        if metadata:
+            metadata_rows.extend(metadata)
+
+    individual_results = _concat_with_race(individual_parts)
+    team_results       = _concat_with_race(team_parts)
+    metadata_results   = pd.DataFrame(metadata_rows)
+
+    # ints mixed with the None of no-table/error rows would infer float64
+    if "table_index" in metadata_results:
+        metadata_results["table_index"] = metadata_results["table_index"].astype("Int64")
 
     return individual_results, team_results, metadata_results
 
@@ -768,6 +1036,7 @@ def test_format_detection():
         print("🌐 Launching browser...")
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
+        page.route("**/*", lambda route: route.abort() if _should_block(route.request) else route.continue_())
         
         for i, test in enumerate(test_cases, 1):
             print(f"\n{'=' * 80}")
@@ -780,17 +1049,15 @@ def test_format_detection():
                 # Fetch the page
                 print("📥 Fetching page...")
                 page.goto(test['url'], wait_until="domcontentloaded", timeout=60000)
-                page.wait_for_timeout(2000)
+                try:
+                    page.wait_for_selector(RESULTS_SELECTOR, state="attached", timeout=15000)
+                except PlaywrightTimeoutError:
+                    print("⚠ No results found after 15 seconds — continuing")
                 html = page.content()
                 
-                # Run all detectors
+                # Run all detectors (one parse shared by all four)
                 print("🔍 Running detectors...")
-                scores = {
-                    "cole": detect_cole(html),
-                    "max": detect_max(html),
-                    "adam": detect_adam(html),
-                    "katie": detect_katie(html)
-                }
+                scores = score_all(html)
                 
                 # Determine winner
                 best_format = max(scores, key=scores.get)
@@ -863,6 +1130,7 @@ def test_format_detection():
 
 
 if __name__ == "__main__":
+    _configure_logging()
     test_format_detection()
 
 
@@ -903,6 +1171,47 @@ if __name__ == "__main__":
     print(f"   Team results: {len(team_all)} rows")
 '''
 
+# ============================================================
+# LOADING URLS / SAVING RESULTS
+# ============================================================
+
+# Prefer pyarrow (multithreaded CSV reader, compressed columnar Parquet
+# for result files); fall back to pandas' C reader and CSV if it isn't installed.
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+
+def load_race_urls(path: str) -> list:
+    """
+    Read only the race_url column of a race-URL CSV; the other columns
+    are never parsed or held in memory.
+    """
+    engine = "pyarrow" if _HAS_PYARROW else "c"
+    return pd.read_csv(path, usecols=["race_url"], engine=engine)["race_url"].tolist()
+
+
+def save_results(df: pd.DataFrame, path_stem: str) -> str:
+    """
+    Write `df` to <path_stem>.parquet (zstd) or, without pyarrow,
+    <path_stem>.csv. Returns the path written.
+    """
+    if not _HAS_PYARROW:
+        path = path_stem + ".csv"
+        df.to_csv(path, index=False)
+        return path
+
+    # Object columns can mix ints and strings (e.g. place from the
+    # wranglers vs the table parser), which Arrow rejects; store them
+    # as text, the same values a CSV would hold
+    object_cols = df.columns[df.dtypes == object]
+    path = path_stem + ".parquet"
+    df.astype({c: "string" for c in object_cols}).to_parquet(path, index=False, compression="zstd")
+    return path
+
+
 # ============================================================
 # DIAGNOSTIC MODE — SAMPLE SUBSET OF URLS
 # ============================================================
@@ -910,15 +1219,14 @@ if __name__ == "__main__":
 if __name__ == "__main__":
     input_csv = r"race_urls_2016.0.csv"
 
-    df   = pd.read_csv(input_csv)
-    # adjust n as you like; 80 is a decent compromise
-    urls = df["race_url"].tolist()
+    urls = load_race_urls(input_csv)
 
     print("\n==============================")
-    print("  DIAGNOSTIC MODE: 80 URLs")
+    print(f"  DIAGNOSTIC MODE: {len(urls)} URLs")
     print("==============================\n")
 
-    individual, team, metadata = process_urls_and_save_wrapped(urls)
+    # `--cache` records pages to a HAR on the first run and replays them after
+    individual, team, metadata = process_urls_and_save_wrapped(urls, cache="--cache" in sys.argv)
 
     # Ensure row_count numeric
     if "row_count" in metadata.columns:
@@ -926,14 +1234,16 @@ if __name__ == "__main__":
     else:
         metadata["row_count"] = 0
 
-    print("\n=== PARSER FAILURE SUMMARY (SAMPLED 80 URLS) ===")
+    print(f"\n=== PARSER FAILURE SUMMARY ({len(urls)} URLS) ===")
     if "assigned_parser" not in metadata.columns:
         metadata["assigned_parser"] = "unknown"
 
+    # Precomputed zero flag + named aggregations, so both reducers run
+    # natively instead of calling a Python lambda per group
     summary = (
-        metadata.groupby("assigned_parser")["row_count"]
-        .agg(["count", lambda x: (x == 0).sum()])
-        .rename(columns={"count": "urls_assigned", "<lambda_0>": "urls_with_zero_rows"})
+        metadata.assign(zero_rows=metadata["row_count"].eq(0))
+        .groupby("assigned_parser")
+        .agg(urls_assigned=("row_count", "count"), urls_with_zero_rows=("zero_rows", "sum"))
     )
     summary["failure_rate"] = summary["urls_with_zero_rows"] / summary["urls_assigned"]
     print(summary)
@@ -941,9 +1251,9 @@ if __name__ == "__main__":
     # Write diagnostic outputs
     output_dir = r"output/diagnostic"
     os.makedirs(output_dir, exist_ok=True)
-    individual.to_csv(os.path.join(output_dir, "diag_individual.csv"), index=False)
-    team.to_csv(os.path.join(output_dir, "diag_team.csv"), index=False)
-    metadata.to_csv(os.path.join(output_dir, "diag_metadata.csv"), index=False)
+    save_results(individual, os.path.join(output_dir, "diag_individual"))
+    save_results(team, os.path.join(output_dir, "diag_team"))
+    save_results(metadata, os.path.join(output_dir, "diag_metadata"))
 
     print("\nDiagnostic complete. Files saved in 'output/diagnostic'.\n")
 
@@ -957,13 +1267,13 @@ if __name__ == "__main__":
     # print("  FULL RUN: ALL URLs")
     # print("==============================\n")
     #
-    # urls_all = df["race_url"].tolist()
+    # urls_all = load_race_urls(input_csv)
     # individual_all, team_all, metadata_all = process_urls_and_save_wrapped(urls_all)
     #
     # full_output_dir = r"output/full_run_all"
     # os.makedirs(full_output_dir, exist_ok=True)
-    # individual_all.to_csv(os.path.join(full_output_dir, "individual.csv"), index=False)
-    # team_all.to_csv(os.path.join(full_output_dir, "team.csv"), index=False)
-    # metadata_all.to_csv(os.path.join(full_output_dir, "metadata.csv"), index=False)
+    # save_results(individual_all, os.path.join(full_output_dir, "individual"))
+    # save_results(team_all, os.path.join(full_output_dir, "team"))
+    # save_results(metadata_all, os.path.join(full_output_dir, "metadata"))
     #
     # print("\n✓ FULL RUN COMPLETE\n")
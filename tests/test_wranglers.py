@@ -0,0 +1,76 @@
+import os
+import sys
+import types
+import unittest
+
+# The wranglers don't need a browser; stand in for playwright when it isn't
+# installed so the module imports.
+try:
+    import playwright.sync_api  # noqa: F401
+    import playwright.async_api  # noqa: F401
+except ImportError:
+    _playwright = types.ModuleType("playwright")
+    _sync_api = types.ModuleType("playwright.sync_api")
+    _sync_api.sync_playwright = None
+    _sync_api.TimeoutError = TimeoutError
+    _async_api = types.ModuleType("playwright.async_api")
+    _async_api.async_playwright = None
+    _playwright.sync_api = _sync_api
+    _playwright.async_api = _async_api
+    sys.modules.update({
+        "playwright": _playwright,
+        "playwright.sync_api": _sync_api,
+        "playwright.async_api": _async_api,
+    })
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from get_milesplit_formatted_meet_results import wrangle_cole  # noqa: E402
+
+
+# Five line-based rows followed by a Team Scores section in the same <pre>
+COLE_WITH_TEAM_SCORES = """
+<div id="meetResultsBody"><pre>
+Place Grade Name Time Team
+1. 8 Ava Lopez 11:02.3 PR Lincoln
+2. 7 Ben Kim 11:15.0 Roosevelt
+3 8 Cara Diaz 11:20.4 SR Lincoln
+4. 6 Dan Wu 11:31.9 Jefferson
+5. 7 Eve Stone 11:45.2 Roosevelt
+
+Team Scores
+1. Lincoln 45
+2. Roosevelt 60
+</pre></div>
+"""
+
+# Records run together on one line, so only the packed pattern matches
+COLE_PACKED = """
+<div id="meetResultsBody"><pre>1. 10 Ann Lee 23:25 PR Lincoln 2. 11 Bo Park 23:40 Roosevelt 3. 9 Cy Ng 24:01 Lincoln</pre></div>
+"""
+
+
+class WrangleColeTest(unittest.TestCase):
+
+    def test_team_scores_section_stays_out_of_last_row(self):
+        df = wrangle_cole(COLE_WITH_TEAM_SCORES)
+
+        self.assertEqual(df["place"].tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(
+            df["team"].tolist(),
+            ["Lincoln", "Roosevelt", "Lincoln", "Jefferson", "Roosevelt"]
+        )
+        self.assertEqual(df["athlete"].iloc[-1], "Eve Stone")
+        self.assertEqual(df["finish"].iloc[-1], "11:45.2")
+
+    def test_packed_text_falls_back_to_packed_pattern(self):
+        df = wrangle_cole(COLE_PACKED)
+
+        self.assertEqual(df["place"].tolist(), [1, 2, 3])
+        self.assertEqual(df["athlete"].tolist(), ["Ann Lee", "Bo Park", "Cy Ng"])
+        self.assertEqual(df["grade"].tolist(), [10, 11, 9])
+        self.assertEqual(df["team"].tolist(), ["Lincoln", "Roosevelt", "Lincoln"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,101 +1,165 @@
+import argparse
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+import lxml.html
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --------------------------------------------------
-# CONFIGURATION
+# CONFIGURATION (defaults; override on the command line)
 # --------------------------------------------------
-STATE_SUBDOMAIN = "wa"
-BASE_URL = f"https://{STATE_SUBDOMAIN}.milesplit.com/results"
-
-YEARS = range(2015, 2021)           # 2015 → 2020
+DEFAULT_STATE = "wa"                # MileSplit state subdomain
+DEFAULT_YEARS = range(2015, 2021)   # 2015 → 2020
 MONTHS = [8, 9, 10, 11]             # Typical XC season
 SEASON = "cross_country"
 LEVEL = "hs"
 
 OUTPUT_DIR = "data"
-OUTPUT_FILE = f"{OUTPUT_DIR}/wa_hs_xc_meet_urls_2015_2020.csv"
 
-# --------------------------------------------------
-# SET UP OUTPUT DIRECTORY
-# --------------------------------------------------
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+MAX_WORKERS = 8                     # year/month sweeps fetched in parallel
+MAX_RETRIES = 5                     # per page, for throttling / server errors
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
 
-# --------------------------------------------------
-# SET UP SELENIUM (CHROME)
-# --------------------------------------------------
-options = Options()
-options.add_argument("--headless")          # Run without opening a browser window
-options.add_argument("--window-size=1920,1080")
-options.add_argument("--disable-gpu")
+# Meet link in a results row (same as the CSS selector "td.name a")
+NAME_LINK_XPATH = ".//td[contains(concat(' ', normalize-space(@class), ' '), ' name ')]//a"
 
-driver = webdriver.Chrome(options=options)
 
-# --------------------------------------------------
-# SCRAPING LOGIC
-# --------------------------------------------------
-all_meet_data = []
-
-for year in YEARS:
-    for month in MONTHS:
-        page = 1
-        while True:
-            url = (
-                f"{BASE_URL}?"
-                f"year={year}"
-                f"&month={month}"
-                f"&season={SEASON}"
-                f"&level={LEVEL}"
-                f"&page={page}"
-            )
-
-            print(f"Loading: {url}")
-            driver.get(url)
-            time.sleep(3)  # allow JavaScript to load results
-
-            rows = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-            if not rows:
-                break
-
-            found_valid_row = False
-            for row in rows:
-                try:
-                    name_link = row.find_element(By.CSS_SELECTOR, "td.name a")
-                    meet_name = name_link.text.strip()
-                    meet_url = name_link.get_attribute("href")
-
-                    all_meet_data.append({
-                        "meet_name": meet_name,
-                        "meet_url": meet_url,
-                        "year": year,
-                        "month": month,
-                        "state": "WA",
-                        "level": "HS",
-                        "season": "XC"
-                    })
-
-                    found_valid_row = True
-
-                except:
-                    continue  # skip ads/spacer rows
-
-            if not found_valid_row:
-                break
-
-            page += 1
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collect MileSplit meet result URLs.")
+    parser.add_argument("--years", type=int, nargs="+", default=list(DEFAULT_YEARS),
+                        help="season years to scrape (default: 2015-2020)")
+    parser.add_argument("--state", default=DEFAULT_STATE,
+                        help="MileSplit state subdomain, e.g. wa (default: wa)")
+    parser.add_argument("--out", default=None,
+                        help=f"output CSV (default: {OUTPUT_DIR}/<state>_hs_xc_meet_urls_<first>_<last>.csv)")
+    return parser.parse_args()
+
 
 # --------------------------------------------------
-# CLEAN UP & SAVE
+# SET UP HTTP SESSION
 # --------------------------------------------------
-driver.quit()
+def make_session():
+    """
+    The results listing is server-rendered HTML, so a plain HTTP session is
+    enough: no browser start-up and no per-page sleep. One keep-alive
+    connection per worker thread. Throttled (429) and 5xx pages are
+    retried with exponential backoff (honouring Retry-After).
+    """
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+    )
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    session.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS, max_retries=retry))
+    return session
 
-df = pd.DataFrame(all_meet_data).drop_duplicates()
-df.to_csv(OUTPUT_FILE, index=False)
 
-print("\n----------------------------------")
-print(f"Saved {len(df)} meet URLs")
-print(f"File: {OUTPUT_FILE}")
-print("----------------------------------")
+# --------------------------------------------------
+# SCRAPING LOGIC
+# --------------------------------------------------
+def scrape_month(session, state, year, month):
+    """
+    Collect every meet listed for one year/month, following pages
+    until a page has no meet rows.
+    """
+    base_url = f"https://{state}.milesplit.com/results"
+
+    meets = []
+    page = 1
+    while True:
+        url = (
+            f"{base_url}?"
+            f"year={year}"
+            f"&month={month}"
+            f"&season={SEASON}"
+            f"&level={LEVEL}"
+            f"&page={page}"
+        )
+
+        print(f"Loading: {url}")
+        response = session.get(url, timeout=20)
+        # An error page has no result rows and would read as "no more pages"
+        response.raise_for_status()
+
+        tree = lxml.html.fromstring(response.content)
+        tree.make_links_absolute(response.url)
+
+        # //table//tr rather than table/tbody/tr: lxml doesn't add the
+        # implied <tbody> a browser would
+        rows = tree.xpath("//table//tr")
+        if not rows:
+            break
+
+        found_valid_row = False
+        for row in rows:
+            name_links = row.xpath(NAME_LINK_XPATH)
+            if not name_links:
+                continue  # skip ads/spacer rows
+
+            name_link = name_links[0]
+            meets.append({
+                "meet_name": name_link.text_content().strip(),
+                "meet_url": name_link.get("href"),
+                "year": year,
+                "month": month,
+                "state": state.upper(),
+                "level": "HS",
+                "season": "XC"
+            })
+
+            found_valid_row = True
+
+        if not found_valid_row:
+            break
+
+        page += 1
+
+    return meets
+
+
+def main():
+    args = parse_args()
+    years = sorted(args.years)
+    output_file = args.out or f"{OUTPUT_DIR}/{args.state}_hs_xc_meet_urls_{years[0]}_{years[-1]}.csv"
+
+    # --------------------------------------------------
+    # SET UP OUTPUT DIRECTORY
+    # --------------------------------------------------
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+
+    # Each year/month paginates on its own, so sweep them in parallel;
+    # map() keeps the results in years x MONTHS order
+    sweeps = [(year, month) for year in years for month in MONTHS]
+
+    session = make_session()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        all_meet_data = [
+            meet
+            for meets in pool.map(lambda sweep: scrape_month(session, args.state, *sweep), sweeps)
+            for meet in meets
+        ]
+
+    # --------------------------------------------------
+    # CLEAN UP & SAVE
+    # --------------------------------------------------
+    session.close()
+
+    df = pd.DataFrame(all_meet_data).drop_duplicates()
+    df.to_csv(output_file, index=False)
+
+    print("\n----------------------------------")
+    print(f"Saved {len(df)} meet URLs")
+    print(f"File: {output_file}")
+    print("----------------------------------")
+
+
+if __name__ == "__main__":
+    main()